@@ -1,2 +1,12 @@
+from vectorstackai.__version__ import __version__
 from vectorstackai.client import Client
-from vectorstackai.api_resources import Embedding
\ No newline at end of file
+from vectorstackai.api_resources import Embedding
+
+
+def __getattr__(name):
+    # AsyncClient pulls in asyncio, so it is only imported when first used
+    if name == "AsyncClient":
+        from vectorstackai.async_client import AsyncClient
+
+        return AsyncClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
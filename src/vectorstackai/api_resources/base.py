@@ -0,0 +1,98 @@
+import gzip
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from vectorstackai import error
+from vectorstackai.utils import json_dumps, raise_error_from_response
+
+
+class BaseAPIResource(object):
+    DEFAULT_TIMEOUT = 300
+    HEADERS = {
+        "accept": "application/json",
+        "content-type": "application/json",
+        # gzip and deflate, plus br/zstd when urllib3 can decode them
+        "accept-encoding": ACCEPT_ENCODING,
+    }
+    # Request bodies smaller than this are never compressed
+    COMPRESSION_THRESHOLD = 1024
+
+    # A single session shared by every resource (and every Client) so that
+    # keep-alive connections are pooled and the TCP+TLS handshake is paid once
+    # per connection instead of once per request. Created on first use.
+    _session = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def _get_session(cls):
+        """Returns the shared session, creating it on first use."""
+        session = BaseAPIResource._session
+        if session is None:
+            with BaseAPIResource._session_lock:
+                session = BaseAPIResource._session
+                if session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=100, max_retries=0)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    BaseAPIResource._session = session
+        return session
+
+    @classmethod
+    def _close_session(cls):
+        """Closes the shared session's pooled connections; the next request opens a new one."""
+        with BaseAPIResource._session_lock:
+            session, BaseAPIResource._session = BaseAPIResource._session, None
+        if session is not None:
+            session.close()
+
+    @classmethod
+    def _make_request(cls, method, url, json_data, **kwargs):
+        """
+        Sends a JSON request through the shared session.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to send the request to.
+            json_data (dict): The JSON body of the request.
+            **kwargs: Connection parameters; `request_timeout` sets the timeout in seconds,
+                `compress_requests` ("gzip"/True or "zstd") compresses bodies larger than
+                COMPRESSION_THRESHOLD bytes, and `session` overrides the shared session.
+
+        Returns:
+            requests.Response: The successful (HTTP 200) response.
+
+        Raises:
+            VectorStackAIError: An appropriate subclass of VectorStackAIError based on the error type.
+        """
+        headers = cls.HEADERS
+        body = json_dumps(json_data)
+        encoding = kwargs.get("compress_requests")
+        if encoding and len(body) > cls.COMPRESSION_THRESHOLD:
+            if encoding == "zstd":
+                import zstandard
+
+                body = zstandard.ZstdCompressor(level=3).compress(body)
+            else:
+                # Level 1 captures most of the size reduction for a negligible CPU cost
+                body = gzip.compress(body, compresslevel=1)
+                encoding = "gzip"
+            headers = {**headers, "content-encoding": encoding}
+
+        session = kwargs.get("session") or cls._get_session()
+        try:
+            response = session.request(method,
+                                       url,
+                                       headers=headers,
+                                       data=body,
+                                       timeout=kwargs.get("request_timeout", cls.DEFAULT_TIMEOUT))
+        except requests.exceptions.Timeout as e:
+            raise error.Timeout(message=str(e)) from e
+
+        if response.status_code != 200:
+            raise_error_from_response(response)
+
+        return response
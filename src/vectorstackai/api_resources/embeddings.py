@@ -1,14 +1,4 @@
-import requests
-from vectorstackai.objects import EmbeddingsObject
-from vectorstackai import error
-from vectorstackai.utils import raise_error_from_response
-
-class BaseAPIResource(object):
-    DEFAULT_TIMEOUT = 300
-    HEADERS = {
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
+from vectorstackai.api_resources.base import BaseAPIResource
 
 class Embedding(BaseAPIResource):
     """
@@ -33,7 +23,7 @@ class Embedding(BaseAPIResource):
             **kwargs: Additional keyword arguments.
 
         Returns:
-            EmbeddingsObject: An object containing the generated embeddings and related information.
+            requests.Response: The successful API response, to be decoded by EmbeddingsObject.
 
         Raises:
             VectorStackError: An appropriate subclass of VectorStackError based on the error type.
@@ -48,14 +38,4 @@ class Embedding(BaseAPIResource):
             'api_key': kwargs.get("api_key"),
             'model': model,
         } 
-        response = requests.post(cls.CLASS_URL, 
-                                 headers=cls.HEADERS, 
-                                 json=json_data, 
-                                 timeout=kwargs.get("request_timeout", cls.DEFAULT_TIMEOUT)) 
-       
-        if response.status_code != 200:
-            raise_error_from_response(response)
-            
-        return response
-    
-    
+        return cls._make_request("post", cls.CLASS_URL, json_data, **kwargs)
@@ -0,0 +1,130 @@
+import asyncio
+import functools
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import requests
+
+from vectorstackai.client import Client
+from vectorstackai.objects import EmbeddingsObject
+
+
+class AsyncClient:
+    """VectorStack AI asyncio Client
+
+    Same interface as `Client`, but every method is a coroutine so that
+    independent calls can be overlapped with `asyncio.gather`. Requests run in
+    the event loop's default executor and share `Client`'s pooled HTTP session.
+
+    Args:
+        api_key (str): Your API key.
+        max_retries (int): Maximum number of retries if API call fails.
+        timeout (float): Timeout in seconds.
+        max_batch_size (int): Default maximum number of texts sent per request;
+            larger inputs are split into several requests.
+        max_workers (int): Maximum number of requests a single `embed` call
+            sends concurrently (capped at 32).
+        prewarm (bool): Open a pooled connection to the API in a background
+            thread so the first request skips the TCP+TLS handshake.
+        cache_size (int): Number of embeddings kept in an in-memory LRU cache.
+            0 (the default) disables caching.
+        compress_requests (bool or str): Compress request bodies larger than
+            1 KiB with gzip (True or "gzip") or zstd ("zstd"). Only enable this
+            if the API endpoint accepts the matching `Content-Encoding`.
+        session (requests.Session): Session used for this client's requests
+            instead of the connection pool shared by all clients.
+        cache: Embedding cache to use instead of the one created from
+            `cache_size` (see `Client`).
+        retry_initial_backoff (float): Upper bound in seconds of the jittered
+            wait before the first retry.
+        retry_max_backoff (float): Maximum wait in seconds between retries,
+            including delays requested via `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_retries: int = 3,
+        timeout: Optional[float] = 30,
+        max_batch_size: int = 128,
+        max_workers: int = 4,
+        prewarm: bool = False,
+        cache_size: int = 0,
+        compress_requests: Union[bool, str] = False,
+        session: Optional[requests.Session] = None,
+        cache: Optional[Any] = None,
+        retry_initial_backoff: float = 0.1,
+        retry_max_backoff: float = 8,
+    ) -> None:
+        self._client = Client(
+            api_key=api_key,
+            max_retries=max_retries,
+            timeout=timeout,
+            max_batch_size=max_batch_size,
+            max_workers=max_workers,
+            prewarm=prewarm,
+            cache_size=cache_size,
+            compress_requests=compress_requests,
+            session=session,
+            cache=cache,
+            retry_initial_backoff=retry_initial_backoff,
+            retry_max_backoff=retry_max_backoff,
+        )
+        self.api_key = self._client.api_key
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def aclose(self) -> None:
+        """Release the resources owned by this client (see `Client.close`)."""
+        self._client.close()
+
+    async def embed(
+        self,
+        texts: Sequence[str],
+        model: str,
+        is_query: bool = False,
+        instruction: str = "",
+        batch_size: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> EmbeddingsObject:
+        """Coroutine version of `Client.embed`."""
+        return await self._client.aembed(
+            texts,
+            model=model,
+            is_query=is_query,
+            instruction=instruction,
+            batch_size=batch_size,
+            use_cache=use_cache,
+        )
+
+    async def embed_batch(
+        self,
+        texts: Iterable[str],
+        model: str,
+        is_query: bool = False,
+        instruction: str = "",
+        batch_size: Optional[int] = None,
+    ) -> EmbeddingsObject:
+        """Coroutine version of `Client.embed_batch`."""
+        return await self.embed(
+            list(texts),
+            model=model,
+            is_query=is_query,
+            instruction=instruction,
+            batch_size=batch_size,
+        )
+
+    async def embed_rows(
+        self,
+        rows: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> List[Any]:
+        """Coroutine version of `Client.embed_rows`."""
+        return await self._run(self._client.embed_rows, rows, batch_size=batch_size)
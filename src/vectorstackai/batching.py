@@ -0,0 +1,135 @@
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, InvalidStateError
+
+
+class BatchDispatcher:
+    """
+    Coalesces concurrent single-text embedding requests into batched API calls.
+
+    Texts submitted from any thread are queued and embedded by a background
+    thread in batches of up to `max_batch_size`. Batching is eager: a batch is
+    sent as soon as it is full or `max_wait` seconds after its oldest text was
+    submitted, so texts that queued up while the previous batch was in flight
+    are sent immediately instead of waiting for the window again.
+
+    Args:
+        client (Client): The client used to send the batched requests.
+        max_batch_size (int, optional): Maximum number of texts per batch.
+            Defaults to the client's `max_batch_size`.
+        max_wait (float): Maximum time in seconds a text waits for others to
+            join its batch.
+    """
+
+    def __init__(self, client, max_batch_size=None, max_wait=0.005):
+        self.client = client
+        self.max_batch_size = max_batch_size or client.max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def submit(self, text, model, is_query=False, instruction=""):
+        """
+        Queues one text for embedding.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the text's embedding vector,
+                or to the exception raised while embedding its batch.
+        """
+        # Checked here rather than by `Client.embed` so a bad call fails its
+        # caller instead of the batch it would be dispatched with
+        if not isinstance(text, str):
+            raise ValueError("'text' must be a string")
+        if not isinstance(model, str):
+            raise ValueError("'model' must be a string")
+        if not isinstance(is_query, bool):
+            raise ValueError("'is_query' must be a boolean")
+        if not isinstance(instruction, str):
+            raise ValueError("'instruction' must be a string")
+
+        future = Future()
+        # Enqueue under the lock so every accepted text is ahead of the
+        # sentinel put by `close`
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot submit texts to a closed BatchDispatcher")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="vectorstackai-batcher", daemon=True)
+                self._thread.start()
+            self._queue.put((time.monotonic(), text, (model, is_query, instruction), future))
+        return future
+
+    def close(self):
+        """
+        Stops the background thread after the already queued texts are embedded.
+
+        Texts submitted after `close` are rejected with RuntimeError.
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                if self._thread is not None:
+                    self._queue.put(None)
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = item[0] + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                self._dispatch(batch)
+            except BaseException as e:
+                # Never let one batch end the thread; fail whatever it left unresolved
+                for *_, future in batch:
+                    if not future.done():
+                        try:
+                            future.set_exception(e)
+                        except InvalidStateError:
+                            pass
+            if stop:
+                return
+
+    def _dispatch(self, batch):
+        groups = defaultdict(list)
+        for _, text, params, future in batch:
+            # Skip futures the caller cancelled while they were queued
+            if future.set_running_or_notify_cancel():
+                groups[params].append((text, future))
+
+        for (model, is_query, instruction), items in groups.items():
+            try:
+                embeddings = self.client.embed(
+                    [text for text, _ in items],
+                    model=model,
+                    is_query=is_query,
+                    instruction=instruction,
+                    batch_size=self.max_batch_size,
+                ).embeddings
+            except BaseException as e:
+                for _, future in items:
+                    future.set_exception(e)
+            else:
+                for (_, future), embedding in zip(items, embeddings):
+                    future.set_result(embedding)
@@ -0,0 +1,56 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class EmbeddingCache:
+    """
+    Thread-safe in-memory LRU cache of embedding vectors.
+
+    Vectors are keyed by a hash of the text and every parameter that affects
+    its embedding, so cached results are only reused for identical requests.
+
+    Args:
+        max_size (int): Maximum number of vectors kept. The least recently
+            used vectors are evicted first.
+    """
+
+    def __init__(self, max_size=10000):
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValueError("'max_size' must be a positive integer")
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text, model, is_query, instruction):
+        """Returns the cache key for one text embedded with the given parameters."""
+        # Length-prefix the variable-length fields so different inputs cannot collide
+        key = "{0}:{1}|{2}|{3}:{4}|{5}".format(
+            len(model), model, int(is_query), len(instruction), instruction, text
+        )
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key):
+        """Returns the cached vector for `key`, or None if it is not cached."""
+        with self._lock:
+            vector = self._data.get(key)
+            if vector is not None:
+                self._data.move_to_end(key)
+            return vector
+
+    def set(self, key, vector):
+        """Stores `vector` under `key`, evicting the least recently used vectors if full."""
+        with self._lock:
+            self._data[key] = vector
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Removes all cached vectors."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
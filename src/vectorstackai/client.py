@@ -1,20 +1,73 @@
-from typing import Any, List, Optional
+import functools
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 
-from tenacity import (
-    Retrying,
-    stop_after_attempt,
-    wait_exponential_jitter,
-    retry_if_exception_type,
-)
+import requests
 
 import vectorstackai
 import vectorstackai.error as error
+from vectorstackai.batching import BatchDispatcher
+from vectorstackai.cache import EmbeddingCache
 from vectorstackai.utils import get_api_key
 from vectorstackai.objects import EmbeddingsObject
 
 #TODO:
 # - Base64 encoding
 
+# Transient failures that are retried
+_RETRY_ON = (
+    error.RateLimitError,
+    error.ServiceUnavailableError,
+    error.Timeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def _retry_after(exc) -> Optional[float]:
+    """Return the delay in seconds requested by an error's `Retry-After` header, if any."""
+    headers = getattr(exc, "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(float(headers.get("retry-after")), 0.0)
+    except (TypeError, ValueError):
+        # Header missing or given as an HTTP date
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _make_retry_controller(max_retries: int, initial_backoff: float, max_backoff: float):
+    """Build the `Retrying` template for a retry configuration.
+
+    Cached so clients with the same settings don't rebuild the policy; never
+    hand out the cached object itself, only copies of it.
+    """
+    # Imported here rather than at module level to keep `import vectorstackai` cheap
+    from tenacity import (
+        Retrying,
+        stop_after_attempt,
+        wait_random_exponential,
+        retry_if_exception_type,
+    )
+
+    backoff = wait_random_exponential(multiplier=initial_backoff, max=max_backoff)
+
+    def wait(retry_state):
+        delay = _retry_after(retry_state.outcome.exception())
+        # Capped so a large Retry-After can't block the calling thread for long
+        return backoff(retry_state) if delay is None else min(delay, max_backoff)
+
+    return Retrying(
+        reraise=True,
+        stop=stop_after_attempt(max_retries),
+        wait=wait,
+        retry=retry_if_exception_type(_RETRY_ON),
+    )
+
+
 class Client:
     """VectorStack AI Client
 
@@ -22,54 +75,296 @@ class Client:
         api_key (str): Your API key.
         max_retries (int): Maximum number of retries if API call fails.
         timeout (float): Timeout in seconds.
+        max_batch_size (int): Default maximum number of texts sent per request;
+            larger inputs are split into several requests.
+        max_workers (int): Maximum number of requests a single `embed` call
+            sends concurrently (capped at 32).
+        prewarm (bool): Open a pooled connection to the API in a background
+            thread so the first request skips the TCP+TLS handshake.
+        cache_size (int): Number of embeddings kept in an in-memory LRU cache,
+            so texts embedded again with the same model and parameters skip
+            the API. 0 (the default) disables caching.
+        compress_requests (bool or str): Compress request bodies larger than
+            1 KiB with gzip (True or "gzip") or zstd ("zstd", requires the
+            `zstandard` package). Only enable this if the API endpoint accepts
+            the matching `Content-Encoding`.
+        session (requests.Session): Session used for this client's requests
+            instead of the connection pool shared by all clients.
+        cache: Embedding cache to use instead of the one created from
+            `cache_size`; any object with `get(key)` and `set(key, vector)`
+            methods (such as `EmbeddingCache` or a wrapper around a persistent
+            store). Keys are built with `EmbeddingCache.make_key`.
+        retry_initial_backoff (float): Upper bound in seconds of the jittered
+            wait before the first retry; it doubles on every further retry.
+        retry_max_backoff (float): Maximum wait in seconds between retries.
+            When the API sends a `Retry-After` header, that delay is used
+            instead of the jittered backoff, up to this same maximum.
     """
 
+    MAX_WORKERS_LIMIT = 32
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         max_retries: int = 3,
         timeout: Optional[float] = 30,
+        max_batch_size: int = 128,
+        max_workers: int = 4,
+        prewarm: bool = False,
+        cache_size: int = 0,
+        compress_requests: Union[bool, str] = False,
+        session: Optional[requests.Session] = None,
+        cache: Optional[Any] = None,
+        retry_initial_backoff: float = 0.1,
+        retry_max_backoff: float = 8,
     ) -> None:
 
+        if not isinstance(max_batch_size, int) or max_batch_size < 1:
+            raise ValueError("'max_batch_size' must be a positive integer")
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("'max_workers' must be a positive integer")
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError("'cache_size' must be a non-negative integer")
+        if compress_requests not in (False, True, "gzip", "zstd"):
+            raise ValueError("'compress_requests' must be a boolean, 'gzip' or 'zstd'")
+        if compress_requests == "zstd":
+            # Fail here rather than on the first large request if `zstandard` is missing
+            import zstandard  # noqa: F401
+
         self.api_key = api_key or get_api_key()
+        self.max_batch_size = max_batch_size
+        self.max_workers = min(max_workers, self.MAX_WORKERS_LIMIT)
+        if cache is None and cache_size:
+            cache = EmbeddingCache(cache_size)
+        self.cache = cache
 
         self._params = {
             "api_key": self.api_key,
             "request_timeout": timeout,
+            "compress_requests": compress_requests,
         }
-        self.retry_controller = Retrying(
-            reraise=True,
-            stop=stop_after_attempt(max_retries),
-            wait=wait_exponential_jitter(initial=1, max=16),
-            retry=(
-                retry_if_exception_type(error.RateLimitError)
-                | retry_if_exception_type(error.ServiceUnavailableError)
-                | retry_if_exception_type(error.Timeout)
-            ),
-        )
+        self._session = session
+        if session is not None:
+            self._params["session"] = session
+        # A copy of the shared template, so customising one client's
+        # `retry_controller` doesn't change retries for other clients
+        self.retry_controller = _make_retry_controller(max_retries, retry_initial_backoff, retry_max_backoff).copy()
+        self._dispatcher = None
+        self._dispatcher_lock = threading.Lock()
+        if prewarm:
+            threading.Thread(target=self._prewarm, daemon=True).start()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _prewarm(self) -> None:
+        """Open a keep-alive connection in the session's pool."""
+        session = self._session or vectorstackai.Embedding._get_session()
+        try:
+            session.head(vectorstackai.Embedding.CLASS_URL, timeout=5)
+        except requests.RequestException:
+            pass
+
+    def close(self) -> None:
+        """Release the resources owned by this client.
+
+        Texts queued with `embed_queued` are embedded first, then the
+        client's own `session` is closed if one was given. The connection
+        pool shared by all clients is left open, so closing a short-lived
+        client (e.g. at the end of a `with` block) doesn't cost the next
+        client a new TCP+TLS handshake; use `close_shared_session` for that.
+        """
+        with self._dispatcher_lock:
+            dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None:
+            dispatcher.close()
+        if self._session is not None:
+            self._session.close()
+
+    @staticmethod
+    def close_shared_session() -> None:
+        """Close the connection pool shared by all clients in the process.
+
+        Requests made afterwards simply open new connections.
+        """
+        vectorstackai.Embedding._close_session()
 
     def embed(
         self,
-        texts: List[str],
+        texts: Sequence[str],
         model: str,
         is_query: bool = False,
         instruction: str = "",
+        batch_size: Optional[int] = None,
+        use_cache: bool = True,
     ) -> EmbeddingsObject:
-        
-        
+        """Embed a list of texts.
+
+        Inputs of any length are accepted: `texts` is split into chunks of at
+        most `batch_size` texts and each chunk is sent as a single request, so
+        one call with 1,000 texts replaces 1,000 single-text round trips.
+        Chunks are sent concurrently on up to `max_workers` threads, and the
+        results are concatenated in input order.
+
+        Args:
+            texts (Sequence[str]): A list or tuple of texts to embed.
+            model (str): The name of the model to use for embedding.
+            is_query (bool): Whether the input is a query or not.
+            instruction (str): Additional instruction for the embedding process.
+            batch_size (int): Maximum number of texts sent per request. Defaults
+                to the client's `max_batch_size`.
+            use_cache (bool): Whether to read and update the client's embedding
+                cache, if one is configured.
+
+        Returns:
+            EmbeddingsObject: The embeddings of all texts, in input order.
+        """
         # Validate input arguments
-        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
-            raise ValueError("'texts' must be a list of strings")
-        if not isinstance(model, str):
-            raise ValueError("'model' must be a string")
-        if not isinstance(is_query, bool):
-            raise ValueError("'is_query' must be a boolean")
-        if not isinstance(instruction, str):
-            raise ValueError("'instruction' must be a string")
-
-        for attempt in self.retry_controller:
+        if not isinstance(texts, (list, tuple)):
+            raise ValueError("'texts' must be a list or tuple of strings")
+        if not texts:
+            raise ValueError("'texts' must not be empty")
+        for text in texts:
+            # `type(...) is str` is the cheap common case; isinstance keeps str subclasses valid
+            if type(text) is not str and not isinstance(text, str):
+                raise ValueError("'texts' must be a list or tuple of strings")
+        # One combined check for the common case; the detailed checks only run when it fails
+        if type(model) is not str or type(is_query) is not bool or type(instruction) is not str:
+            if not isinstance(model, str):
+                raise ValueError("'model' must be a string")
+            if not isinstance(is_query, bool):
+                raise ValueError("'is_query' must be a boolean")
+            if not isinstance(instruction, str):
+                raise ValueError("'instruction' must be a string")
+        if batch_size is None:
+            batch_size = self.max_batch_size
+        elif not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("'batch_size' must be a positive integer")
+
+        # Send each distinct text once; `inverse[i]` is the row of texts[i] in the response
+        unique_rows = {}
+        inverse = [unique_rows.setdefault(text, len(unique_rows)) for text in texts]
+        unique_texts = list(unique_rows)
+
+        if self.cache is not None and use_cache:
+            embeddings = self._embed_cached(unique_texts, model, is_query, instruction, batch_size)
+        else:
+            embeddings = self._embed_unique(unique_texts, model, is_query, instruction, batch_size)
+
+        if len(unique_texts) < len(texts):
+            embeddings.embeddings = embeddings.embeddings[inverse]
+        return embeddings
+
+    async def aembed(
+        self,
+        texts: Sequence[str],
+        model: str,
+        is_query: bool = False,
+        instruction: str = "",
+        batch_size: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> EmbeddingsObject:
+        """Coroutine version of `embed`.
+
+        The request runs in the event loop's default executor, so independent
+        calls can be overlapped with `asyncio.gather` without blocking the loop.
+        Arguments and return value are the same as for `embed`.
+        """
+        # Imported here so `import vectorstackai` doesn't pay for asyncio
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.embed,
+                texts,
+                model=model,
+                is_query=is_query,
+                instruction=instruction,
+                batch_size=batch_size,
+                use_cache=use_cache,
+            ),
+        )
+
+    def _embed_unique(
+        self,
+        texts: List[str],
+        model: str,
+        is_query: bool,
+        instruction: str,
+        batch_size: int,
+    ) -> EmbeddingsObject:
+        """Embed texts in chunks of at most `batch_size`, sending chunks concurrently."""
+        chunks = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        if len(chunks) == 1:
+            return self._encode(chunks[0], model, is_query, instruction)
+
+        results = [None] * len(chunks)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            futures = {
+                executor.submit(self._encode, chunk, model, is_query, instruction): i
+                for i, chunk in enumerate(chunks)
+            }
+            try:
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+            except BaseException:
+                # Fail fast: don't start chunks that are still queued
+                for future in futures:
+                    future.cancel()
+                raise
+        return EmbeddingsObject.concatenate(results)
+
+    def _embed_cached(
+        self,
+        texts: List[str],
+        model: str,
+        is_query: bool,
+        instruction: str,
+        batch_size: int,
+    ) -> EmbeddingsObject:
+        """Embed texts, fetching only the ones missing from the cache."""
+        import numpy as np
+
+        keys = [EmbeddingCache.make_key(text, model, is_query, instruction) for text in texts]
+        vectors = [self.cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if not missing:
+            return EmbeddingsObject.from_array(np.stack(vectors))
+
+        fetched = self._embed_unique([texts[i] for i in missing], model, is_query, instruction, batch_size)
+        if len(missing) == len(texts):
+            result = fetched.embeddings
+        else:
+            # Scatter hits and misses straight into one preallocated array
+            result = np.empty((len(texts), fetched.embeddings.shape[1]), dtype=fetched.embeddings.dtype)
+            result[missing] = fetched.embeddings
+            for i, vector in enumerate(vectors):
+                if vector is not None:
+                    result[i] = vector
+        for i, vector in zip(missing, fetched.embeddings):
+            # Copy so the cache holds the row, not a view pinning the whole response buffer
+            self.cache.set(keys[i], vector.copy())
+        return EmbeddingsObject.from_array(result, response=fetched.response)
+
+    def _encode(
+        self,
+        texts: List[str],
+        model: str,
+        is_query: bool,
+        instruction: str,
+    ) -> EmbeddingsObject:
+        """Embed one chunk of texts with a single request, retrying transient failures."""
+        encode = vectorstackai.Embedding.encode
+        # `retry_controller` is only a template: each call iterates its own copy so
+        # concurrent calls from several threads never share retry state
+        for attempt in self.retry_controller.copy():
             with attempt:
-                response = vectorstackai.Embedding.encode(
+                response = encode(
                     texts=texts,
                     model=model,
                     is_query=is_query,
@@ -77,3 +372,103 @@ class Client:
                     **self._params,
                 )
         return EmbeddingsObject(response, batch_size=len(texts))
+
+    def embed_queued(
+        self,
+        text: str,
+        model: str,
+        is_query: bool = False,
+        instruction: str = "",
+    ) -> Future:
+        """Queue a single text to be embedded together with other queued texts.
+
+        Meant for callers that embed one text per request (e.g. one per web
+        request handler): texts queued concurrently from any thread are
+        coalesced into batched API calls by a background `BatchDispatcher`
+        instead of each paying for its own round trip.
+
+        Args:
+            text (str): The text to embed.
+            model (str): The name of the model to use for embedding.
+            is_query (bool): Whether the input is a query or not.
+            instruction (str): Additional instruction for the embedding process.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the text's embedding vector.
+        """
+        if self._dispatcher is None:
+            with self._dispatcher_lock:
+                if self._dispatcher is None:
+                    self._dispatcher = BatchDispatcher(self)
+        return self._dispatcher.submit(text, model=model, is_query=is_query, instruction=instruction)
+
+    def embed_batch(
+        self,
+        texts: Iterable[str],
+        model: str,
+        is_query: bool = False,
+        instruction: str = "",
+        batch_size: Optional[int] = None,
+    ) -> EmbeddingsObject:
+        """Embed texts from any iterable.
+
+        Equivalent to `embed(list(texts), ...)`; see `embed` for how the
+        texts are chunked and sent.
+
+        Args:
+            texts (Iterable[str]): The texts to embed.
+            model (str): The name of the model to use for embedding.
+            is_query (bool): Whether the input is a query or not.
+            instruction (str): Additional instruction for the embedding process.
+            batch_size (int): Maximum number of texts sent per request. Defaults
+                to the client's `max_batch_size`.
+
+        Returns:
+            EmbeddingsObject: The embeddings of all texts, in input order.
+        """
+        return self.embed(
+            list(texts),
+            model=model,
+            is_query=is_query,
+            instruction=instruction,
+            batch_size=batch_size,
+        )
+
+    def embed_rows(
+        self,
+        rows: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> List[Any]:
+        """Embed rows that do not all share the same model and parameters.
+
+        Rows are grouped by `(model, is_query, instruction)` and each group is
+        embedded with `embed_batch`, so N rows cost one request per group (and
+        per `batch_size` texts) instead of one request per row.
+
+        Args:
+            rows (List[Dict[str, Any]]): Rows with a 'text' and a 'model' key, and
+                optional 'is_query' (default False) and 'instruction' (default "") keys.
+            batch_size (int): Maximum number of texts sent per request. Defaults
+                to the client's `max_batch_size`.
+
+        Returns:
+            List[numpy.ndarray]: One embedding vector per row, in input order.
+                Rows embedded with different models may have different dimensions.
+        """
+        buckets = defaultdict(list)
+        for i, row in enumerate(rows):
+            key = (row['model'], row.get('is_query', False), row.get('instruction', ""))
+            buckets[key].append(i)
+
+        results = [None] * len(rows)
+        for (model, is_query, instruction), indices in buckets.items():
+            embeddings = self.embed_batch(
+                [rows[i]['text'] for i in indices],
+                model=model,
+                is_query=is_query,
+                instruction=instruction,
+                batch_size=batch_size,
+            ).embeddings
+            for i, embedding in zip(indices, embeddings):
+                results[i] = embedding
+        return results
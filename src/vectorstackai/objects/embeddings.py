@@ -1,6 +1,21 @@
+import operator
 import requests
 import base64
-import numpy as np
+from vectorstackai.utils import json_loads
+
+
+def _stdlib_b64decode(encoded):
+    # Decode into a bytearray like pybase64 does, so the embeddings array is
+    # writable whichever decoder is installed
+    return bytearray(base64.b64decode(encoded))
+
+
+try:
+    # Optional SIMD base64 decoder; decodes straight into a bytearray
+    from pybase64 import b64decode_as_bytearray as _b64decode
+except ImportError:
+    _b64decode = _stdlib_b64decode
+
 class BaseObject:
     response: requests.Response = None
 
@@ -10,28 +25,142 @@ class EmbeddingsObject(BaseObject):
 
     Attributes:
         response: requests.Response
-        embeddings (List[List[float]]): The list of embeddings returned by the API
+        embeddings (numpy.ndarray): A float16 array of shape (num_embeddings, embedding_dims).
+            Use `embeddings.tolist()` to get nested Python lists. The array is
+            decoded from the response on first access.
+
+    The object also supports `len()`, indexing by row and `numpy.asarray()`.
     """
     def __init__(self, response, batch_size):
         self.response = response
-        self.embeddings = None
+        self._embeddings = None
+        self._embeddings_base64 = None
         if response.status_code == 200:
-            # Get the base64 encoded embeddings string
-            embeddings_base64 = response.json()['output']['embeddings']
-            
+            # Keep the base64 encoded embeddings string; it is only decoded
+            # when `embeddings` is first accessed
+            encoded = json_loads(response.content)['output']['embeddings']
+
+            # Check the shape now so a malformed payload fails in the call that
+            # received it rather than on first access
+            num_bytes = len(encoded) * 3 // 4 - encoded[-2:].count('=')
+            if len(encoded) % 4 or num_bytes % (2 * batch_size):
+                raise ValueError(
+                    f"Embeddings payload of {num_bytes} bytes cannot be split into {batch_size} float16 rows"
+                )
+            self._batch_size = batch_size
+            self._embedding_dims = num_bytes // 2 // batch_size
+            self._embeddings_base64 = encoded
+
+    @property
+    def embeddings(self):
+        # Read the encoded string once: another thread may decode and clear it concurrently
+        encoded = self._embeddings_base64
+        if encoded is not None:
+            # NumPy is imported lazily so `import vectorstackai` does not pay for it
+            import numpy as np
+
             # Decode the base64 string back into bytes
-            embeddings_bytes = base64.b64decode(embeddings_base64)
-            
-            # Convert the byte string back into a NumPy array
-            self.embeddings = np.frombuffer(embeddings_bytes, dtype=np.float16).reshape(batch_size, -1)
+            embeddings_bytes = _b64decode(encoded)
+
+            # Convert the byte string back into a NumPy array; it is published
+            # before the string is cleared, so readers always see one of the two
+            self._embeddings = np.frombuffer(embeddings_bytes, dtype=np.float16).reshape(self._batch_size, -1)
+            self._embeddings_base64 = None
+        return self._embeddings
+
+    @embeddings.setter
+    def embeddings(self, embeddings):
+        self._embeddings = embeddings
+        self._embeddings_base64 = None
+
+    @classmethod
+    def from_array(cls, embeddings, response=None):
+        """
+        Create an EmbeddingsObject from an already decoded embeddings array.
+        """
+        obj = cls.__new__(cls)
+        obj.response = response
+        obj.embeddings = embeddings
+        return obj
+
+    @classmethod
+    def concatenate(cls, objects):
+        """
+        Combine several EmbeddingsObjects into one, preserving their order.
+
+        The combined object is not backed by a single API response, so its
+        `response` attribute is None.
+        """
+        import numpy as np
+
+        return cls.from_array(np.concatenate([o.embeddings for o in objects]))
         
+    def as_float32_normalized(self):
+        """
+        Return the embeddings as a new float32 array with L2-normalized rows,
+        ready for cosine similarity via dot products.
+        """
+        import numpy as np
+
+        out = self.embeddings.astype(np.float32)
+        # einsum computes the row norms without materializing an array of squares
+        norms = np.sqrt(np.einsum("ij,ij->i", out, out))
+        out /= np.maximum(norms, 1e-12)[:, None]
+        return out
+
+    def __len__(self) -> int:
+        if self._embeddings_base64 is not None:
+            return self._batch_size
+        return 0 if self._embeddings is None else len(self._embeddings)
+
+    def __getitem__(self, index):
+        """
+        Return one embedding (or, for slices and arrays of indices, several).
+
+        While the embeddings are still encoded, an integer index decodes only
+        the bytes of that row instead of the whole batch.
+        """
+        # bool is an int subclass but indexes a NumPy array as a mask, so it
+        # takes the decoded path to behave the same before and after decoding
+        encoded = self._embeddings_base64
+        if encoded is None or isinstance(index, bool):
+            return self.embeddings[index]
+        try:
+            index = operator.index(index)
+        except TypeError:
+            return self.embeddings[index]
+
+        import numpy as np
+
+        num_embeddings, embedding_dims = self._batch_size, self._embedding_dims
+        if not -num_embeddings <= index < num_embeddings:
+            raise IndexError("embedding index out of range")
+        row_bytes = embedding_dims * 2
+        start = (index % num_embeddings) * row_bytes
+        # base64 encodes every 3 bytes as 4 characters, so decode whole groups
+        # around the row and trim the surplus bytes
+        first_group = start // 3
+        last_group = -(-(start + row_bytes) // 3)
+        decoded = _b64decode(encoded[first_group * 4:last_group * 4])
+        offset = start - first_group * 3
+        return np.frombuffer(decoded, dtype=np.float16, count=embedding_dims, offset=offset)
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+
+        if copy:
+            return np.array(self.embeddings, dtype=dtype)
+        return np.asarray(self.embeddings, dtype=dtype)
+
     def __str__(self) -> str:
-        if self.embeddings is not None:
-            num_embeddings = len(self.embeddings)
-            embedding_dims = len(self.embeddings[0])
+        if self._embeddings_base64 is not None:
+            num_embeddings, embedding_dims = self._batch_size, self._embedding_dims
+            return f"EmbeddingsObject(num_embeddings={num_embeddings}, embedding_dims={embedding_dims})"
+        elif self._embeddings is not None:
+            num_embeddings, embedding_dims = self._embeddings.shape
             return f"EmbeddingsObject(num_embeddings={num_embeddings}, embedding_dims={embedding_dims})"
         else:
             return "Error: EmbeddingsObject(no embeddings returned)"
-        
+
     def __repr__(self) -> str:
         return self.__str__()   
\ No newline at end of file
@@ -1,11 +1,65 @@
+import json
 import os
 import requests
 
 import vectorstackai
 from vectorstackai import error
 
-def get_api_key() -> str:
-    api_key = getattr(vectorstackai, 'api_key', None) or os.environ.get("VECTORSTACKAI_API_KEY")
+try:
+    import orjson
+except ImportError:  # optional (`vectorstackai[fast]`); the stdlib encoder is used without it
+    orjson = None
+
+
+def _stdlib_json_dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+if orjson is not None:
+    def json_dumps(obj) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            # orjson rejects lone surrogates (e.g. text decoded with surrogateescape);
+            # the stdlib escapes them as \udXXX, as the original `json=` path did
+            return _stdlib_json_dumps(obj)
+
+    json_loads = orjson.loads
+else:
+    json_dumps = _stdlib_json_dumps
+    json_loads = json.loads
+
+# Mapping of error type names returned by the API to their exception classes,
+# built once at import time.
+_ERROR_CLASS_MAPPING = {
+    name: cls
+    for name, cls in vars(error).items()
+    if isinstance(cls, type) and issubclass(cls, error.VectorStackAIError)
+}
+
+
+# API key read from the environment, cached once found
+_env_api_key = None
+
+
+def _api_key_from_env():
+    global _env_api_key
+    if _env_api_key is None:
+        # Only a key that was found is cached, so a variable set after a failed
+        # lookup is still picked up; `get_api_key(refresh=True)` re-reads it
+        api_key = os.environ.get("VECTORSTACKAI_API_KEY")
+        if not api_key:
+            return api_key
+        _env_api_key = api_key
+    return _env_api_key
+
+
+def get_api_key(refresh: bool = False) -> str:
+    global _env_api_key
+    # `vectorstackai.api_key` is checked on every call so setting it in code always takes effect
+    if refresh:
+        _env_api_key = None
+    api_key = getattr(vectorstackai, 'api_key', None) or _api_key_from_env()
 
     if api_key is not None:
         return api_key
@@ -31,19 +85,13 @@ def raise_error_from_response(response):
         VectorStackAIError: An appropriate subclass of VectorStackAIError based on the error type.
 
     Note:
-        This function assumes that the error response is in JSON format and follows
-        a specific structure with an 'error' key containing error details.
+        The error details are read from the 'error' object of a JSON response. Bodies
+        that are not JSON, or lack that object, still raise VectorStackAIError, using
+        the raw body or the HTTP reason phrase as the message.
     """
     
-    # Dynamically create mapping of error types to exception classes
-    error_class_mapping = {
-        name: getattr(error, name)
-        for name in dir(error)
-        if isinstance(getattr(error, name), type) and issubclass(getattr(error, name), error.VectorStackAIError)
-    }
-    
-    # Handle server unavailable or bad gateway error
-    if response.status_code in [404, 502]:
+    # Handle server unavailable, internal server or gateway errors
+    if response.status_code in {404, 500, 502, 503, 504}:
         raise error.ServiceUnavailableError(message='Server unavailable/down ..', 
                                       http_status=response.status_code, 
                                       json_body={}, 
@@ -51,21 +99,24 @@ def raise_error_from_response(response):
 
     # Get the error data from the response
     try:
-        error_data = response.json().get('error', {})
+        body = response.json()
     except requests.exceptions.JSONDecodeError:
         # Handle the case where the response does not contain valid JSON
+        body = {'error': {'message': response.content.decode('utf-8', errors='replace')}}
+    error_data = body.get('error') if isinstance(body, dict) else None
+    if not isinstance(error_data, dict):
+        # Valid JSON without the expected 'error' object
         error_data = {}
-        error_data['message'] = response.content.decode('utf-8', errors='replace')
-        
-    message = error_data.get('message')
-    http_status = error_data.get('http_status')
+
+    message = error_data.get('message') or response.reason
+    http_status = error_data.get('http_status') or response.status_code
     code = error_data.get('code')
     http_body = error_data.get('http_body')
     json_body = error_data.get('json_body')
     headers = response.headers
 
     # Get the corresponding exception class based on the error type
-    exception_class = error_class_mapping.get(error_data.get('type'), error.VectorStackAIError)
+    exception_class = _ERROR_CLASS_MAPPING.get(error_data.get('type'), error.VectorStackAIError)
 
     # Raise the exception with the appropriate data
     raise exception_class(
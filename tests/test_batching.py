@@ -0,0 +1,144 @@
+import threading
+
+import numpy as np
+import pytest
+
+from vectorstackai.batching import BatchDispatcher
+from vectorstackai.objects import EmbeddingsObject
+
+
+class FakeClient:
+    """Stands in for `Client`; embeds each text as [len(text), is_query]."""
+
+    def __init__(self, max_batch_size=128):
+        self.max_batch_size = max_batch_size
+        self.calls = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def embed(self, texts, model, is_query=False, instruction="", batch_size=None):
+        self.entered.set()
+        self.release.wait()
+        self.calls.append((list(texts), model, is_query, instruction))
+        if instruction == "fail":
+            raise ValueError("embedding failed")
+        return EmbeddingsObject.from_array(
+            np.array([[len(text), is_query] for text in texts], dtype=np.float16)
+        )
+
+
+def test_results_match_submission_order():
+    client = FakeClient()
+    dispatcher = BatchDispatcher(client, max_wait=0.05)
+    texts = ["x" * i for i in range(1, 50)]
+    futures = [dispatcher.submit(text, model="m") for text in texts]
+
+    assert [f.result(timeout=2)[0] for f in futures] == [len(text) for text in texts]
+    assert len(client.calls) < len(texts)
+    dispatcher.close()
+
+
+def test_batches_respect_max_batch_size_and_group_by_params():
+    client = FakeClient(max_batch_size=4)
+    dispatcher = BatchDispatcher(client, max_wait=0.05)
+    futures = [dispatcher.submit("a" * i, model="m", is_query=i % 2 == 0) for i in range(1, 11)]
+
+    for i, future in enumerate(futures, start=1):
+        assert future.result(timeout=2).tolist() == [i, i % 2 == 0]
+    for texts, _, is_query, _ in client.calls:
+        assert len(texts) <= 4
+        assert all((len(text) % 2 == 0) == is_query for text in texts)
+    dispatcher.close()
+
+
+def test_errors_propagate_to_the_failed_group_only():
+    client = FakeClient()
+    client.release.clear()
+    dispatcher = BatchDispatcher(client, max_wait=0.05)
+    blocker = dispatcher.submit("first", model="m")
+    ok = dispatcher.submit("ok", model="m")
+    bad = dispatcher.submit("bad", model="m", instruction="fail")
+    client.release.set()
+
+    assert blocker.result(timeout=2)[0] == 5
+    assert ok.result(timeout=2)[0] == 2
+    with pytest.raises(ValueError, match="embedding failed"):
+        bad.result(timeout=2)
+    # The worker survives the failure
+    assert dispatcher.submit("abc", model="m").result(timeout=2)[0] == 3
+    dispatcher.close()
+
+
+def test_unexpected_dispatch_error_fails_batch_and_keeps_thread_alive():
+    client = FakeClient()
+    dispatcher = BatchDispatcher(client)
+    original = dispatcher._dispatch
+    dispatcher._dispatch = lambda batch: 1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        dispatcher.submit("a", model="m").result(timeout=2)
+    assert dispatcher._thread.is_alive()
+
+    dispatcher._dispatch = original
+    assert dispatcher.submit("ab", model="m").result(timeout=2)[0] == 2
+    dispatcher.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"text": 1, "model": "m"},
+        {"text": "a", "model": None},
+        {"text": "a", "model": "m", "is_query": "yes"},
+        {"text": "a", "model": "m", "instruction": ["x"]},
+    ],
+)
+def test_submit_validates_arguments(kwargs):
+    dispatcher = BatchDispatcher(FakeClient())
+    with pytest.raises(ValueError):
+        dispatcher.submit(**kwargs)
+    dispatcher.close()
+
+
+def test_cancelled_futures_are_not_embedded():
+    client = FakeClient()
+    client.release.clear()
+    dispatcher = BatchDispatcher(client, max_wait=0)
+    first = dispatcher.submit("first", model="m")
+    # Wait until the worker is blocked embedding `first`
+    assert client.entered.wait(timeout=2)
+    cancelled = dispatcher.submit("cancelled", model="m")
+    kept = dispatcher.submit("kept", model="m")
+    assert cancelled.cancel()
+    client.release.set()
+
+    assert first.result(timeout=2)[0] == 5
+    assert kept.result(timeout=2)[0] == 4
+    assert cancelled.cancelled()
+    assert all("cancelled" not in texts for texts, *_ in client.calls)
+    dispatcher.close()
+
+
+def test_close_drains_queued_texts_and_rejects_new_ones():
+    client = FakeClient()
+    client.release.clear()
+    dispatcher = BatchDispatcher(client, max_wait=0)
+    futures = [dispatcher.submit("a" * i, model="m") for i in range(1, 6)]
+
+    closer = threading.Thread(target=dispatcher.close)
+    closer.start()
+    client.release.set()
+    closer.join(timeout=2)
+
+    assert not closer.is_alive()
+    assert [f.result(timeout=0)[0] for f in futures] == [1, 2, 3, 4, 5]
+    with pytest.raises(RuntimeError):
+        dispatcher.submit("late", model="m")
+    dispatcher.close()
+
+
+def test_close_without_submissions_does_not_start_a_thread():
+    dispatcher = BatchDispatcher(FakeClient())
+    dispatcher.close()
+    assert dispatcher._thread is None
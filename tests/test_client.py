@@ -0,0 +1,82 @@
+import requests
+
+import vectorstackai
+from vectorstackai.api_resources.base import BaseAPIResource
+
+
+def test_close_keeps_the_shared_session_open():
+    shared = BaseAPIResource._get_session()
+    with vectorstackai.Client(api_key="k"):
+        pass
+    assert BaseAPIResource._session is shared
+
+    vectorstackai.Client.close_shared_session()
+    assert BaseAPIResource._session is None
+
+
+def test_close_closes_the_clients_own_session():
+    closed = []
+    session = requests.Session()
+    session.close = lambda: closed.append(True)
+    with vectorstackai.Client(api_key="k", session=session):
+        pass
+    assert closed == [True]
+
+
+def _wait_after(client, exc):
+    from tenacity import RetryCallState
+
+    state = RetryCallState(client.retry_controller, fn=None, args=(), kwargs={})
+    state.set_exception((type(exc), exc, None))
+    return client.retry_controller.wait(state)
+
+
+def test_retry_after_is_honoured_up_to_max_backoff():
+    client = vectorstackai.Client(api_key="k", retry_max_backoff=8)
+    short = vectorstackai.error.RateLimitError("slow down", headers={"retry-after": "0.5"})
+    long = vectorstackai.error.ServiceUnavailableError("down", headers={"retry-after": "3600"})
+    assert _wait_after(client, short) == 0.5
+    assert _wait_after(client, long) == 8
+
+
+def test_import_does_not_load_asyncio():
+    import os
+    import subprocess
+    import sys
+
+    code = "import sys, vectorstackai; print('asyncio' in sys.modules)"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    assert result.stdout.strip() == "False"
+    assert vectorstackai.AsyncClient.__name__ == "AsyncClient"
+
+
+def test_retry_controller_is_not_shared_between_clients():
+    from tenacity import stop_after_attempt
+
+    a = vectorstackai.Client(api_key="k")
+    b = vectorstackai.Client(api_key="k")
+    assert a.retry_controller is not b.retry_controller
+
+    a.retry_controller.stop = stop_after_attempt(1)
+    assert b.retry_controller.stop is not a.retry_controller.stop
+
+
+def test_api_key_set_after_a_failed_lookup_is_picked_up(monkeypatch):
+    import pytest
+
+    from vectorstackai import utils
+
+    monkeypatch.setattr(utils, "_env_api_key", None)
+    monkeypatch.delattr(vectorstackai, "api_key", raising=False)
+    monkeypatch.delenv("VECTORSTACKAI_API_KEY", raising=False)
+    with pytest.raises(vectorstackai.error.AuthenticationError):
+        vectorstackai.Client()
+
+    monkeypatch.setenv("VECTORSTACKAI_API_KEY", "from-env")
+    assert vectorstackai.Client().api_key == "from-env"
+
+    # Once found, the key is cached
+    monkeypatch.setenv("VECTORSTACKAI_API_KEY", "changed")
+    assert vectorstackai.Client().api_key == "from-env"
+    assert utils.get_api_key(refresh=True) == "changed"
@@ -0,0 +1,123 @@
+import base64
+
+import numpy as np
+import pytest
+
+from vectorstackai.objects import EmbeddingsObject
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, embeddings):
+        encoded = base64.b64encode(embeddings.tobytes())
+        self.content = b'{"output":{"embeddings":"%s"}}' % encoded
+
+
+def make(num_embeddings, embedding_dims, seed=0):
+    rng = np.random.default_rng(seed)
+    expected = rng.random((num_embeddings, embedding_dims)).astype(np.float16)
+    return expected, FakeResponse(expected)
+
+
+@pytest.mark.parametrize("num_embeddings", range(1, 7))
+@pytest.mark.parametrize("embedding_dims", range(1, 40))
+def test_getitem_decodes_single_rows(num_embeddings, embedding_dims):
+    expected, response = make(num_embeddings, embedding_dims)
+    for index in list(range(num_embeddings)) + list(range(-num_embeddings, 0)):
+        obj = EmbeddingsObject(response, batch_size=num_embeddings)
+        row = obj[index]
+        assert obj._embeddings_base64 is not None, "a single row must not decode the batch"
+        assert row.dtype == np.float16
+        assert np.array_equal(row, expected[index])
+
+
+def test_getitem_out_of_range():
+    _, response = make(3, 5)
+    obj = EmbeddingsObject(response, batch_size=3)
+    with pytest.raises(IndexError):
+        obj[3]
+    with pytest.raises(IndexError):
+        obj[-4]
+
+
+@pytest.mark.parametrize("index", [True, False, np.int64(1), slice(1, None), [0, 2]])
+def test_getitem_matches_decoded_array(index):
+    expected, response = make(3, 5)
+    encoded = EmbeddingsObject(response, batch_size=3)
+    decoded = EmbeddingsObject(response, batch_size=3)
+    decoded.embeddings
+    assert np.array_equal(encoded[index], decoded[index])
+    assert np.array_equal(encoded[index], expected[index])
+
+
+def test_len_str_and_array_without_eager_decode():
+    expected, response = make(4, 7)
+    obj = EmbeddingsObject(response, batch_size=4)
+    assert len(obj) == 4
+    assert str(obj) == "EmbeddingsObject(num_embeddings=4, embedding_dims=7)"
+    assert obj._embeddings_base64 is not None
+
+    assert np.array_equal(np.asarray(obj), expected)
+    assert np.asarray(obj, dtype=np.float32).dtype == np.float32
+    assert [row.tolist() for row in obj] == expected.tolist()
+
+
+class RacingEmbeddingsObject(EmbeddingsObject):
+    """Simulates another thread finishing the decode right after each read of the encoded string."""
+
+    @property
+    def _embeddings_base64(self):
+        value = self.__dict__.get("_encoded")
+        if value is not None:
+            decoded = EmbeddingsObject(self.response, batch_size=self._batch_size).embeddings
+            self.__dict__["_embeddings"] = decoded
+            self.__dict__["_encoded"] = None
+        return value
+
+    @_embeddings_base64.setter
+    def _embeddings_base64(self, value):
+        self.__dict__["_encoded"] = value
+
+
+def test_decode_tolerates_a_concurrent_decode():
+    expected, response = make(4, 7)
+    assert np.array_equal(RacingEmbeddingsObject(response, batch_size=4).embeddings, expected)
+    assert np.array_equal(RacingEmbeddingsObject(response, batch_size=4)[2], expected[2])
+
+
+@pytest.mark.parametrize("batch_size", [2, 4])
+def test_payload_not_matching_batch_size_fails_in_init(batch_size):
+    _, response = make(3, 5)
+    with pytest.raises(ValueError, match="float16 rows"):
+        EmbeddingsObject(response, batch_size=batch_size)
+
+
+def _decoders():
+    from vectorstackai.objects import embeddings
+
+    decoders = [pytest.param(embeddings._stdlib_b64decode, id="stdlib")]
+    try:
+        from pybase64 import b64decode_as_bytearray
+    except ImportError:
+        decoders.append(pytest.param(None, id="pybase64", marks=pytest.mark.skip("pybase64 not installed")))
+    else:
+        decoders.append(pytest.param(b64decode_as_bytearray, id="pybase64"))
+    return decoders
+
+
+@pytest.mark.parametrize("decoder", _decoders())
+def test_decoded_embeddings_are_writable_with_either_decoder(monkeypatch, decoder):
+    from vectorstackai.objects import embeddings
+
+    monkeypatch.setattr(embeddings, "_b64decode", decoder)
+    expected, response = make(3, 5)
+
+    obj = EmbeddingsObject(response, batch_size=3)
+    obj.embeddings[0] = 0
+    obj.embeddings /= 2
+    assert np.array_equal(obj.embeddings[1:], expected[1:] / 2)
+
+    row = EmbeddingsObject(response, batch_size=3)[1]
+    row *= 2
+    assert np.array_equal(row, expected[1] * 2)
@@ -0,0 +1,33 @@
+import json
+
+from vectorstackai.utils import json_dumps, json_loads
+
+
+def test_json_dumps_is_compact_bytes():
+    assert json_dumps({"a": [1, "b"]}) == b'{"a":[1,"b"]}'
+    assert json_loads(json_dumps({"a": [1, "b"]})) == {"a": [1, "b"]}
+
+
+def test_json_dumps_escapes_lone_surrogates():
+    body = json_dumps({"input": {"texts": ["ok", "bad \ud800 text"]}})
+    assert isinstance(body, bytes)
+    assert b"\\ud800" in body
+    assert json.loads(body)["input"]["texts"] == ["ok", "bad \ud800 text"]
+
+
+def test_stdlib_fallback_without_orjson():
+    import os
+    import subprocess
+    import sys
+
+    code = r"""
+import sys
+sys.modules["orjson"] = None  # make `import orjson` fail
+from vectorstackai import utils
+assert utils.orjson is None
+body = utils.json_dumps({"t": ["a", "\ud800"]})
+assert body == b'{"t":["a","\\ud800"]}', body
+assert utils.json_loads(body) == {"t": ["a", "\ud800"]}
+"""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)